@@ -6,13 +6,31 @@ This module extends pywikibot.page.
 
 from __future__ import annotations
 
+import dbm
+import hashlib
+import json
 import re
+import time
 import unicodedata
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
-from functools import lru_cache
-from typing import Any, Generator, Iterable, TypeVar, Union
+from functools import cached_property, lru_cache, partial
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import pywikibot
+from pywikibot.data import api
 from pywikibot.site import Namespace
 from pywikibot.textlib import removeDisabledParts
 
@@ -23,39 +41,334 @@ PageSource = Union[
     pywikibot.page.Page, pywikibot.site.BaseSite, pywikibot.page.BaseLink
 ]
 PageT = TypeVar("PageT", bound="Page")
+# Title and namespace number of a page
+PageKey = Tuple[str, int]
+
+# Maximum number of titles the API accepts in a single request
+MAX_TITLES = 50
+# Maximum number of concurrent API requests (1 for serial requests)
+MAX_WORKERS = 2
+# File used to keep get_redirects results between runs (None to disable),
+# e.g., Path(pywikibot.config.base_dir, "apicache", "redirects")
+REDIRECTS_CACHE: Path | None = None
+# Number of seconds that get_redirects results are kept
+REDIRECTS_CACHE_EXPIRY = 3600
+
+
+class _ControlCharacterTable(Dict[int, Union[int, None]]):
+    """Table for str.translate that removes unicode control characters."""
+
+    def __missing__(self, key: int) -> int | None:
+        """Look up and remember the translation of a character."""
+        value = None if unicodedata.category(chr(key))[0] == "C" else key
+        self[key] = value
+        return value
+
+
+_CONTROL_CHARACTERS = _ControlCharacterTable()
+_BOT_START_END = re.compile(
+    r"^(?P<start>.*?<!--\s*bot start\s*-->)(?P<mid>.*?)"
+    r"(?P<end><!--\s*bot end\s*-->.*)$",
+    flags=re.I | re.S,
+)
+# Whitespace and brackets surrounding a wikilink
+_WIKILINK_BRACKETS = re.compile(r"^\s*\[*|\]*\s*$")
+
+
+def _redirect_targets(
+    site: pywikibot.site.BaseSite, pages: Iterable[pywikibot.Page]
+) -> Iterator[pywikibot.Page]:
+    """
+    Yield the existing pages that redirects resolve to.
+
+    The API follows redirect chains for up to MAX_TITLES pages at a
+    time, so each redirect does not need its own request.
+
+    :param site: Site with the pages
+    :param pages: Redirects to resolve
+    """
+    titles = (page.title(with_section=False) for page in pages)
+    while batch := list(islice(titles, MAX_TITLES)):
+        for data in api.PropertyGenerator(
+            "info",
+            site=site,
+            parameters={"titles": batch, "redirects": True},
+        ):
+            if "missing" not in data and "invalid" not in data:
+                yield pywikibot.Page(site, data["title"])
+
+
+def _page_redirects(
+    page: pywikibot.Page, namespaces: frozenset[int] | None = None
+) -> list[pywikibot.Page]:
+    """
+    Return the redirects to a page.
+
+    :param page: Page to get redirects for
+    :param namespaces: Limit redirects to these namespaces
+    """
+    redirects = []
+    with suppress(pywikibot.exceptions.CircularRedirectError):
+        redirects.extend(page.redirects(namespaces=namespaces))
+    return redirects
+
+
+def _batch_redirects(
+    site: pywikibot.site.BaseSite,
+    pages: Iterable[pywikibot.Page],
+    namespaces: frozenset[int] | None = None,
+) -> Iterator[pywikibot.Page]:
+    """
+    Yield the redirects to pages using as few API requests as possible.
+
+    :param site: Site with the pages
+    :param pages: Pages to get redirects for
+    :param namespaces: Limit redirects to these namespaces
+    """
+    parameters: dict[str, str] = {}
+    if namespaces is not None:
+        parameters["grdnamespace"] = "|".join(map(str, sorted(namespaces)))
+    titles = (page.title(with_section=False) for page in pages)
+    while batch := list(islice(titles, MAX_TITLES)):
+        yield from api.PageGenerator(
+            "redirects", site=site, parameters={**parameters, "titles": batch}
+        )
+
+
+def _site_redirects(
+    site: pywikibot.site.BaseSite,
+    pages: Iterable[pywikibot.Page],
+    namespaces: frozenset[int] | None = None,
+) -> set[pywikibot.Page]:
+    """
+    Return possible titles as pages for pages on a site.
+
+    :param site: Site with the pages
+    :param pages: Pages to get titles for
+    :param namespaces: Limit redirects to these namespaces
+    """
+    link_pages = set()
+    redirects = []
+    for page in site.preloadpages(pages, content=False):
+        if page.isRedirectPage():
+            redirects.append(page)
+        elif page.exists():
+            link_pages.add(page)
+    link_pages.update(_redirect_targets(site, redirects))
+    targets = frozenset(link_pages)
+    try:
+        link_pages.update(_batch_redirects(site, targets, namespaces))
+    except pywikibot.exceptions.APIError as e:
+        # MAX_TITLES is the API's default limit for users without the
+        # apihighlimits right, so a site only rejects the batch if it
+        # is configured with a lower limit. Other errors would recur
+        # for each page.
+        if e.code != "toomanyvalues":
+            raise
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for page_redirects in executor.map(
+                partial(_page_redirects, namespaces=namespaces), targets
+            ):
+                link_pages.update(page_redirects)
+    return link_pages
+
+
+def _page_key(page: pywikibot.Page) -> PageKey:
+    """
+    Return the title and namespace number of a page.
+
+    :param page: Page to get the key for
+    """
+    return page.title(with_section=False), page.namespace().id
+
+
+def _redirects_cache_key(
+    site: pywikibot.site.BaseSite,
+    pages: frozenset[PageKey],
+    namespaces: frozenset[int] | None = None,
+) -> str:
+    """
+    Return the persistent cache key for get_redirects on a site.
+
+    :param site: Site with the pages
+    :param pages: Pages to get titles for
+    :param namespaces: Limit redirects to these namespaces
+    """
+    key = json.dumps(
+        [
+            site.sitename,
+            sorted(pages),
+            None if namespaces is None else sorted(namespaces),
+        ]
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _parse_redirects(value: bytes) -> list[PageKey] | None:
+    """
+    Return pages from a persistent cache entry.
+
+    None is returned if the entry has expired or cannot be read.
+
+    :param value: Cache entry
+    """
+    try:
+        entry = json.loads(value)
+        if time.time() - entry["time"] > REDIRECTS_CACHE_EXPIRY:
+            return None
+        return [(str(title), int(ns)) for title, ns in entry["pages"]]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _load_redirects(key: str) -> list[PageKey] | None:
+    """
+    Return pages from the persistent cache or None if there are none.
+
+    :param key: Cache key
+    """
+    if REDIRECTS_CACHE is None:
+        return None
+    try:
+        with dbm.open(str(REDIRECTS_CACHE), "r") as cache:
+            value = cache.get(key)
+    # dbm.dumb raises SyntaxError and ValueError for a damaged index
+    except Exception:  # pylint: disable=broad-exception-caught
+        return None
+    if value is None:
+        return None
+    pages = _parse_redirects(value)
+    if pages is None:
+        _prune_redirects()
+    return pages
+
+
+def _prune_redirects() -> None:
+    """Remove expired and unreadable entries from the persistent cache."""
+    # Pruning is best effort, e.g., another process may hold the lock.
+    with suppress(Exception):
+        with dbm.open(str(REDIRECTS_CACHE), "w") as cache:
+            for key in list(cache.keys()):
+                if _parse_redirects(cache[key]) is None:
+                    del cache[key]
+
+
+def _store_redirects(key: str, pages: Iterable[PageKey]) -> None:
+    """
+    Store pages in the persistent cache.
+
+    :param key: Cache key
+    :param pages: Pages to store
+    """
+    if REDIRECTS_CACHE is None:
+        return
+    entry = {"time": time.time(), "pages": list(pages)}
+    try:
+        REDIRECTS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with dbm.open(str(REDIRECTS_CACHE), "c") as cache:
+            cache[key] = json.dumps(entry)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        pywikibot.warning(f"Cannot write to {REDIRECTS_CACHE}: {e}")
+
+
+def _namespace_ids(
+    site: pywikibot.site.BaseSite,
+    namespaces: NamespaceType | Iterable[NamespaceType] | None = None,
+) -> frozenset[int] | None:
+    """
+    Return namespace identifiers as namespace numbers.
+
+    None is returned if there are no namespaces.
+
+    :param site: Site for the namespaces
+    :param namespaces: Namespace identifiers
+    """
+    if namespaces is None:
+        return None
+    return (
+        frozenset(ns.id for ns in site.namespaces.resolve(namespaces)) or None
+    )
+
+
+def _redirect_keys(
+    site: pywikibot.site.BaseSite,
+    pages: frozenset[PageKey],
+    namespaces: frozenset[int] | None,
+) -> list[PageKey]:
+    """
+    Return possible titles for pages on a site.
+
+    :param site: Site with the pages
+    :param pages: Pages to get titles for
+    :param namespaces: Limit redirects to these namespace numbers
+    """
+    key = _redirects_cache_key(site, pages, namespaces)
+    link_pages = _load_redirects(key)
+    if link_pages is None:
+        link_pages = [
+            _page_key(page)
+            for page in _site_redirects(
+                site,
+                [pywikibot.Page(site, title, ns=ns) for title, ns in pages],
+                namespaces,
+            )
+        ]
+        _store_redirects(key, link_pages)
+    return link_pages
+
+
+@lru_cache(maxsize=4096)
+def _get_redirects_cached(
+    site: pywikibot.site.BaseSite,
+    pages: frozenset[PageKey],
+    namespaces: frozenset[int] | None,
+) -> frozenset[PageKey]:
+    """
+    Return possible titles for a set of pages on a site.
+
+    Titles are cached instead of pages to keep the cache small.
+    See get_redirects.
+
+    :param site: Site with the pages
+    :param pages: Set of pages to get titles for
+    :param namespaces: Limit redirects to these namespace numbers
+    """
+    return frozenset(_redirect_keys(site, pages, namespaces))
 
 
-@lru_cache
 def get_redirects(
     pages: frozenset[pywikibot.Page],
-    namespaces: NamespaceType | frozenset[NamespaceType] | None = None,
+    namespaces: NamespaceType | Iterable[NamespaceType] | None = None,
 ) -> frozenset[pywikibot.Page]:
     """
     Return possible titles as pages for a set of pages.
 
+    The pages, their redirect targets and the redirects to them are
+    loaded in batches.
+    If the site rejects a batch query for having too many titles, which
+    only happens if it lowers the API's limit, the redirects for each
+    page are queried concurrently instead. Results are cached in memory and, if
+    REDIRECTS_CACHE is set, kept there for REDIRECTS_CACHE_EXPIRY seconds.
+
     :param pages: Set of pages to get titles for
     :param namespaces: Limit redirects to these namespaces
     """
-    link_pages = set()
+    pages_by_site = defaultdict(set)
     for page in pages:
-        with suppress(pywikibot.exceptions.CircularRedirectError):
-            while page.isRedirectPage():
-                page = page.getRedirectTarget()
-        if not page.exists():
-            continue
-        link_pages.add(page)
-        with suppress(pywikibot.exceptions.CircularRedirectError):
-            link_pages.update(page.redirects(namespaces=namespaces))
-    return frozenset(link_pages)
+        pages_by_site[page.site].add(_page_key(page))
+    return frozenset(
+        pywikibot.Page(site, title, ns=ns)
+        for site, site_pages in pages_by_site.items()
+        for title, ns in _get_redirects_cached(
+            site, frozenset(site_pages), _namespace_ids(site, namespaces)
+        )
+    )
 
 
 class Page(pywikibot.Page):
     """Represents a MediaWiki page."""
 
-    BOT_START_END = re.compile(
-        r"^(.*?<!--\s*bot start\s*-->)(.*?)(<!--\s*bot end\s*-->.*)$",
-        flags=re.I | re.S,
-    )
+    BOT_START_END = _BOT_START_END
 
     @classmethod
     def from_wikilink(
@@ -74,13 +387,18 @@ class Page(pywikibot.Page):
         """
         text = removeDisabledParts(str(wikilink), site=site)
         # Remove unicode control characters
-        text = "".join(c for c in text if unicodedata.category(c)[0] != "C")
-        text = text.strip().lstrip("[").rstrip("]")
+        text = text.translate(_CONTROL_CHARACTERS)
+        text = _WIKILINK_BRACKETS.sub("", text)
+        if not text:
+            raise ValueError(
+                f"Cannot create a {cls.__name__} from {wikilink!r}: "
+                "the link does not contain a page title"
+            )
         try:
             link = pywikibot.Link(text, site, default_namespace)
             link.parse()  # To catch any exceptions
             return cls(link)
-        except Exception as e:
+        except (pywikibot.exceptions.Error, ValueError) as e:
             raise ValueError(
                 f"Cannot create a {cls.__name__} from {wikilink!r}: {e}"
             ) from None
@@ -105,7 +423,7 @@ class Page(pywikibot.Page):
                 for tpl in templates
             )
         )
-        return bool(all_template_pages & set(self.templates()))
+        return not all_template_pages.isdisjoint(self.templates())
 
     @property
     def is_article(self) -> bool:
@@ -147,7 +465,7 @@ class Page(pywikibot.Page):
         current_text = self.text  # type: ignore[has-type]
         match_ = self.BOT_START_END.match(current_text)
         if match_:
-            # re.sub will raise if text contains a bad escape
+            # Group numbers also work for overrides without named groups
             self.text = f"{match_.group(1)}\n{text}{match_.group(3)}"
         else:
             self.text = text
@@ -174,38 +492,41 @@ class FilePage(pywikibot.FilePage, Page):
         """
         return super().from_wikilink(wikilink, site, default_namespace)
 
-    @property
+    @cached_property
     def megapixels(self) -> float | None:
         """
         Return the file's megapixels.
 
         Returns None if the dimensions are 0 or unknown.
         """
+        file_info = self.latest_file_info
         try:
-            height = self.latest_file_info.height
-            width = self.latest_file_info.width
+            height = file_info.height
+            width = file_info.width
         except AttributeError:
             return None
         return height * width / 1e6 or None
 
+    def _displays_file(self, page: Page) -> bool:
+        """
+        Return True if the page displays the file. False otherwise.
+
+        :param page: page using the file
+        """
+        # MediaWiki considers file redirects to be using the target flie,
+        # but they are not actually using it.
+        try:
+            if page.namespace() != 6:
+                return True
+            target = (
+                page.getRedirectTarget() if page.isRedirectPage() else None
+            )
+        except pywikibot.exceptions.Error:  # pragma: no cover
+            return True
+        return bool(target != self)
+
     def using_pages(self, **kwargs: Any) -> Generator[Page, None, None]:
         """Yield pages on which the file is displayed."""
-        count = 0
         total = kwargs.pop("total", None)
-        for page in super().using_pages(**kwargs):
-            if total and count >= total:
-                return
-            page = Page(page)
-            # MediaWiki considers file redirects to be using the target flie,
-            # but they are not actually using it.
-            try:
-                if (
-                    page.namespace() != 6
-                    or not page.isRedirectPage()
-                    or page.getRedirectTarget() != self
-                ):
-                    count += 1
-                    yield page
-            except pywikibot.exceptions.Error:  # pragma: no cover
-                count += 1
-                yield page
+        pages = (Page(page) for page in super().using_pages(**kwargs))
+        yield from islice(filter(self._displays_file, pages), total or None)
@@ -6,11 +6,19 @@ This module extends pywikibot.textlib.
 
 from __future__ import annotations
 
-from typing import Iterable
+import re
+from functools import lru_cache
+from typing import Any, Iterable, Iterator
 
 from pywikibot.page import BasePage
+from pywikibot.site import BaseSite
 
 
+try:
+    import re2
+except ImportError:  # pragma: no cover
+    re2 = None
+
 # The namespace names must be substituted into this regex,
 # e.g., FILE_LINK_REGEX.format("|".join(site.namespaces.FILE)).
 # Adds named groups to pywikibot.textlib.FILE_LINK_REGEX
@@ -42,6 +50,51 @@ FILE_LINK_REGEX = r"""
     \]\]
 """
 
+# The characters matched by \s in re. RE2's \s only matches ASCII whitespace.
+_RE2_WHITESPACE = r"[\pZ\t\n\v\f\r\x85\x1c-\x1f]"
+# FILE_LINK_REGEX for RE2, which does not support verbose patterns,
+# lookarounds or backreferences. RE2 does not backtrack, so the groups
+# do not need to be atomic.
+_FILE_LINK_RE2_REGEX = (
+    rf"\[\[{_RE2_WHITESPACE}*(?P<namespace>{{}}){_RE2_WHITESPACE}*:"
+    r"(?P<filename>[^]|]*)"
+    r"(\|(((?P<inner_link>\[\[.*?\]\]))?(?P<other_chars>[^\[\]]*)"
+    r"|(?P<not_wikilink>\[[^]]*\]))*?)??\]\]"
+)
+
+
+@lru_cache(maxsize=32)
+def _file_link_regex(site: BaseSite, use_re2: bool) -> Any:
+    """
+    Return FILE_LINK_REGEX compiled for a site.
+
+    The result is an re.Pattern or, with use_re2, an re2 pattern with
+    the same interface.
+
+    :param site: Site for the namespace names
+    :param use_re2: Compile with google-re2 instead of re
+    """
+    namespaces = "|".join(site.namespaces.FILE)
+    if use_re2:
+        return re2.compile(_FILE_LINK_RE2_REGEX.format(namespaces))
+    return re.compile(FILE_LINK_REGEX.format(namespaces), flags=re.X)
+
+
+def find_file_links(text: str, site: BaseSite) -> Iterator[Any]:
+    """
+    Yield matches of FILE_LINK_REGEX in text.
+
+    google-re2 is used if it is installed since it matches in linear
+    time. It is about 16 times slower than the re module on ordinary
+    wikitext and only faster on adversarial input. Otherwise, the re
+    module is used. The matches are re.Match objects or re2 match
+    objects with the same interface.
+
+    :param text: Text to search
+    :param site: Site with the text
+    """
+    yield from _file_link_regex(site, re2 is not None).finditer(text)
+
 
 def iterable_to_wikitext(
     items: Iterable[object], *, prefix: str = "\n* "
@@ -55,13 +108,16 @@ def iterable_to_wikitext(
     :param items: Items to iterate
     :param prefix: Prefix for each item when there is more than one item
     """
-    if not items:
-        return ""
-    if len(list(items)) == 1:
+    items = list(items)
+    if len(items) == 1:
         prefix = ""
-    text = ""
-    for item in items:
-        if isinstance(item, BasePage):
-            item = item.title(as_link=True, textlink=True)
-        text += f"{prefix}{item}"
-    return text
+    return "".join(
+        [
+            (
+                f"{prefix}{item.title(as_link=True, textlink=True)}"
+                if isinstance(item, BasePage)
+                else f"{prefix}{item}"
+            )
+            for item in items
+        ]
+    )
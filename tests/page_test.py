@@ -2,18 +2,52 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+import dbm
+import json
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+from unittest.mock import MagicMock
 
 import pytest
 import pywikibot
 from pytest_mock import MockerFixture
 
-from pywikibot_extensions.page import FilePage, Page, get_redirects
+from pywikibot_extensions.page import (
+    FilePage,
+    Page,
+    _get_redirects_cached,
+    get_redirects,
+)
 
 
 SITE = pywikibot.Site("test", "wikipedia")
 
 
+@pytest.fixture
+def page_generator(mocker: MockerFixture) -> MagicMock:
+    """
+    Mock the queries made by get_redirects for existing non-redirects.
+
+    The returned api.PageGenerator mock yields no redirects by default.
+    """
+    mocker.patch(
+        "pywikibot_extensions.page.pywikibot.site.APISite.preloadpages",
+        side_effect=lambda pages, **kwargs: iter(pages),
+    )
+    mocker.patch(
+        "pywikibot_extensions.page.pywikibot.Page.isRedirectPage",
+        return_value=False,
+    )
+    mocker.patch(
+        "pywikibot_extensions.page.pywikibot.Page.exists", return_value=True
+    )
+    _get_redirects_cached.cache_clear()
+    return mocker.patch(
+        "pywikibot_extensions.page.api.PageGenerator", return_value=[]
+    )
+
+
 @pytest.mark.parametrize(
     "pages, redirects, expected",
     [
@@ -58,7 +92,11 @@ def test_get_redirects(
 ) -> None:
     """Test get_redirects."""
     mocker.patch(
-        "pywikibot_extensions.page.pywikibot.Page.redirects",
+        "pywikibot_extensions.page.pywikibot.site.APISite.preloadpages",
+        side_effect=lambda pages, **kwargs: iter(pages),
+    )
+    mocker.patch(
+        "pywikibot_extensions.page.api.PageGenerator",
         return_value=redirects,
     )
     mocker.patch(
@@ -69,13 +107,13 @@ def test_get_redirects(
     mocker.patch(
         "pywikibot_extensions.page.pywikibot.Page.exists", return_value=True
     )
-    get_redirects.cache_clear()
+    _get_redirects_cached.cache_clear()
     assert get_redirects(pages) == expected
 
     mocker.patch(
         "pywikibot_extensions.page.pywikibot.Page.exists", return_value=False
     )
-    get_redirects.cache_clear()
+    _get_redirects_cached.cache_clear()
     assert get_redirects(pages) == frozenset()
 
 
@@ -83,18 +121,152 @@ def test_get_redirects_for_redirect(mocker: MockerFixture) -> None:
     """Test get_redirects for a redirect."""
     test_page = pywikibot.Page(SITE, "Testing")
     test_target = pywikibot.Page(SITE, "Test")
-    test_page._isredir = True
-    test_page._redirtarget = test_target
-    test_target._isredir = False
     expected = frozenset([test_target, test_page])
+
+    def preloadpages(
+        pages: Iterable[pywikibot.Page], **kwargs: object
+    ) -> Iterator[pywikibot.Page]:
+        for page in pages:
+            page._isredir = page == test_page
+            yield page
+
     mocker.patch(
-        "pywikibot_extensions.page.pywikibot.Page.redirects",
+        "pywikibot_extensions.page.pywikibot.site.APISite.preloadpages",
+        side_effect=preloadpages,
+    )
+    property_generator = mocker.patch(
+        "pywikibot_extensions.page.api.PropertyGenerator",
+        return_value=[
+            {"title": "Test", "ns": 0},
+            {"title": "Testing2", "ns": 0, "missing": ""},
+        ],
+    )
+    redirects_generator = mocker.patch(
+        "pywikibot_extensions.page.api.PageGenerator",
         return_value=[test_page],
     )
+    _get_redirects_cached.cache_clear()
+    assert get_redirects(frozenset([test_page])) == expected
+    property_generator.assert_called_once_with(
+        "info",
+        site=SITE,
+        parameters={"titles": ["Testing"], "redirects": True},
+    )
+    redirects_generator.assert_called_once_with(
+        "redirects", site=SITE, parameters={"titles": ["Test"]}
+    )
+
+
+def test_get_redirects_batches(page_generator: MagicMock) -> None:
+    """Test get_redirects splits pages into batches of MAX_TITLES."""
+    pages = frozenset(
+        pywikibot.Page(SITE, f"Template:Fred {i}") for i in range(51)
+    )
+    assert get_redirects(pages) == pages
+    assert [
+        len(call.kwargs["parameters"]["titles"])
+        for call in page_generator.call_args_list
+    ] == [50, 1]
+    assert {
+        title
+        for call in page_generator.call_args_list
+        for title in call.kwargs["parameters"]["titles"]
+    } == {page.title() for page in pages}
+
+
+def test_get_redirects_batch_rejected(
+    mocker: MockerFixture, page_generator: MagicMock
+) -> None:
+    """Test get_redirects when the site rejects the batch query."""
+    test_page = pywikibot.Page(SITE, "Template:Qux")
+    test_redirect = pywikibot.Page(SITE, "Template:Quux")
+    page_generator.side_effect = pywikibot.exceptions.APIError(
+        "toomanyvalues", ""
+    )
     mocker.patch(
-        "pywikibot_extensions.page.pywikibot.Page.exists", return_value=True
+        "pywikibot_extensions.page.pywikibot.Page.redirects",
+        return_value=[test_redirect],
     )
+    assert get_redirects(frozenset([test_page]), 10) == frozenset(
+        [test_page, test_redirect]
+    )
+
+    page_generator.side_effect = pywikibot.exceptions.APIError(
+        "readapidenied", ""
+    )
+    _get_redirects_cached.cache_clear()
+    with pytest.raises(pywikibot.exceptions.APIError):
+        get_redirects(frozenset([test_page]), 10)
+
+
+def test_get_redirects_namespaces(page_generator: MagicMock) -> None:
+    """Test get_redirects caches equivalent namespaces together."""
+    test_page = pywikibot.Page(SITE, "Template:Waldo")
+    for namespaces in (10, "Template", SITE.namespaces[10], [10, "10"]):
+        assert get_redirects(frozenset([test_page]), namespaces) == frozenset(
+            [test_page]
+        )
+    assert _get_redirects_cached.cache_info().misses == 1
+    page_generator.assert_called_once_with(
+        "redirects",
+        site=SITE,
+        parameters={"grdnamespace": "10", "titles": ["Template:Waldo"]},
+    )
+    assert get_redirects(frozenset()) == frozenset()
+
+
+def test_get_redirects_persistent_cache(
+    mocker: MockerFixture, page_generator: MagicMock, tmp_path: Path
+) -> None:
+    """Test get_redirects with the persistent cache."""
+    test_page = pywikibot.Page(SITE, "Template:Corge")
+    test_redirect = pywikibot.Page(SITE, "Template:Grault")
+    mocker.patch(
+        "pywikibot_extensions.page.REDIRECTS_CACHE", tmp_path / "a" / "cache"
+    )
+    page_generator.return_value = [test_redirect]
+    expected = frozenset([test_page, test_redirect])
+    assert get_redirects(frozenset([test_page])) == expected
+
+    page_generator.return_value = []
+    _get_redirects_cached.cache_clear()
+    assert get_redirects(frozenset([test_page])) == expected
+    assert get_redirects(frozenset([test_page]), 10) == frozenset([test_page])
+
+    mocker.patch("pywikibot_extensions.page.REDIRECTS_CACHE_EXPIRY", -1)
+    _get_redirects_cached.cache_clear()
+    assert get_redirects(frozenset([test_page])) == frozenset([test_page])
+    with dbm.open(str(tmp_path / "a" / "cache"), "w") as cache:
+        assert len(cache) == 1
+        for key in cache.keys():
+            cache[key] = "{"
+        cache["foo"] = "[]"
+        cache["bar"] = json.dumps({"time": time.time(), "pages": []})
+
+    mocker.patch("pywikibot_extensions.page.REDIRECTS_CACHE_EXPIRY", 3600)
+    page_generator.return_value = [test_redirect]
+    _get_redirects_cached.cache_clear()
     assert get_redirects(frozenset([test_page])) == expected
+    with dbm.open(str(tmp_path / "a" / "cache"), "r") as cache:
+        assert len(cache) == 2
+        assert "bar" in cache
+
+
+@pytest.mark.usefixtures("page_generator")
+def test_get_redirects_persistent_cache_error(
+    mocker: MockerFixture, tmp_path: Path
+) -> None:
+    """Test get_redirects when the persistent cache cannot be used."""
+    test_page = pywikibot.Page(SITE, "Template:Garply")
+    mocker.patch("pywikibot_extensions.page.REDIRECTS_CACHE", tmp_path)
+    warning = mocker.patch("pywikibot_extensions.page.pywikibot.warning")
+    assert get_redirects(frozenset([test_page])) == frozenset([test_page])
+    warning.assert_called_once()
+
+    mocker.patch("pywikibot_extensions.page.dbm.open", side_effect=SyntaxError)
+    _get_redirects_cached.cache_clear()
+    assert get_redirects(frozenset([test_page])) == frozenset([test_page])
+    assert warning.call_count == 2
 
 
 @pytest.mark.parametrize(
@@ -113,10 +285,11 @@ def test_page_from_wikilink(
     assert Page.from_wikilink(wikilink, SITE, namespace) == expected
 
 
-def test_page_from_wikilink_error() -> None:
+@pytest.mark.parametrize("wikilink", ["[[User:Foo]]", "[[ ]]", ""])
+def test_page_from_wikilink_error(wikilink: object) -> None:
     """Test Page.from_wikilnk raises ValueError."""
     with pytest.raises(ValueError, match=r"Cannot create a FilePage from .+:"):
-        FilePage.from_wikilink("[[User:Foo]]", SITE)
+        FilePage.from_wikilink(wikilink, SITE)
 
 
 @pytest.mark.parametrize(
@@ -327,12 +500,15 @@ def test_filepage_megapixels(
     expected: float | None,
 ) -> None:
     """Test FilePage.megapixels."""
-    mocker.patch(
+    latest_file_info = mocker.patch(
         "pywikibot_extensions.page.FilePage.latest_file_info",
-        MockFileInfo(height, width),
+        new_callable=mocker.PropertyMock,
+        return_value=MockFileInfo(height, width),
     )
     test_page = FilePage(SITE, "Sandbox.png")
     assert test_page.megapixels == expected
+    assert test_page.megapixels == expected
+    latest_file_info.assert_called_once_with()
 
 
 @pytest.mark.parametrize(
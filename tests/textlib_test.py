@@ -10,6 +10,29 @@ import pywikibot
 from pywikibot_extensions import textlib
 
 
+@pytest.mark.parametrize("use_re2", [True, False])
+def test_find_file_links(
+    monkeypatch: pytest.MonkeyPatch, use_re2: bool
+) -> None:
+    """Test find_file_links."""
+    if not use_re2:
+        monkeypatch.setattr(textlib, "re2", None)
+    text = (
+        "Foo [[File:Example.jpg|thumb|A [[link]] [http://example.org/ x]]]"
+        " [[Foo]] [[ Image : Bar.png ]] [[File:Baz.svg|[[Qux|quux]]|corge]]"
+        " [[\xa0File\v:Qux.png]]"
+    )
+    assert [
+        (match.group("namespace"), match.group("filename"))
+        for match in textlib.find_file_links(text, pywikibot.Site())
+    ] == [
+        ("File", "Example.jpg"),
+        ("Image", " Bar.png "),
+        ("File", "Baz.svg"),
+        ("File", "Qux.png"),
+    ]
+
+
 @pytest.mark.parametrize(
     "items, prefix, expected",
     [
@@ -28,6 +51,16 @@ from pywikibot_extensions import textlib
             "\n* ",
             "\n* foo\n* baz\n* bar",
         ),
+        (
+            iter(["foo"]),
+            "\n* ",
+            "foo",
+        ),
+        (
+            (item for item in ["foo", "baz", "bar"]),
+            "\n* ",
+            "\n* foo\n* baz\n* bar",
+        ),
         (
             [
                 pywikibot.Page(pywikibot.Site(), "foo"),